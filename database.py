@@ -6,9 +6,23 @@ DB_PATH = os.path.join(os.path.dirname(__file__), "workcover.db")
 
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+    # check_same_thread=False lets a single connection be shared across
+    # Streamlit script-run threads (guarded by sqlite's own serialization).
+    # The statement cache is doubled from the default 128 so the app's full
+    # set of SELECT/INSERT/UPDATE texts stays pre-parsed for the lifetime of
+    # the shared connection.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets dashboard reads proceed while a form is committing, and
+    # NORMAL sync avoids an fsync per commit (safe under WAL).
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    # Memory-map the database file so reads come straight off the page
+    # cache without a read() syscall per page (256 MiB cap).
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
 
@@ -168,6 +182,43 @@ def init_db():
         )
     """)
 
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_certificates_case_cert_to
+        ON certificates (case_id, cert_to DESC)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_cases_status_state
+        ON cases (status, state)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_terminations_case
+        ON terminations (case_id)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_documents_case
+        ON documents (case_id)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_activity_log_case_created
+        ON activity_log (case_id, created_at DESC)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_generated_documents_case_generated
+        ON generated_documents (case_id, generated_at DESC)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_payroll_entries_case_period
+        ON payroll_entries (case_id, period_to DESC)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_doctor_details_case
+        ON doctor_details (case_id, id DESC)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS ix_incident_details_case
+        ON incident_details (case_id, id DESC)
+    """)
+
     conn.commit()
     conn.close()
 